@@ -0,0 +1,95 @@
+import asyncio
+import logging
+
+logger = logging.getLogger(__name__)
+
+class MicroBatcher:
+    '''
+    Coalesce single-row predictions for one model into batched model calls.
+
+    Rows submitted within max_wait_ms of the first row in a batch (up to
+    max_batch rows) are handed to run_batch together, and each caller gets
+    back the result for its own row.
+
+    Input:
+    - run_batch (async callable) = takes a list of rows and returns a list with
+      one result per row, in the same order
+    '''
+
+    def __init__(self, name, run_batch, max_batch=32, max_wait_ms=5):
+        self.name = name
+        self.run_batch = run_batch
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._queue = None
+        self._collector = None
+        self._dispatches = set()
+
+    def start(self):
+        # The queue has to be created inside the running event loop
+        self._queue = asyncio.Queue()
+        self._collector = asyncio.create_task(self._collect())
+
+    async def stop(self):
+        if self._collector is not None:
+            self._collector.cancel()
+            try:
+                await self._collector
+            except asyncio.CancelledError:
+                pass
+            self._collector = None
+        if self._dispatches:
+            await asyncio.gather(*self._dispatches, return_exceptions=True)
+
+    async def submit(self, row):
+        future = asyncio.get_running_loop().create_future()
+        await self._queue.put((row, future))
+        return await future
+
+    async def _collect(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait
+
+            # Gather whatever else arrives before the deadline
+            while len(batch) < self.max_batch:
+                if self._queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    await asyncio.sleep(remaining)
+                    if self._queue.empty():
+                        break
+                batch.append(self._queue.get_nowait())
+
+            # Run the batch in the background so the next one can be collected
+            # while this one is still being predicted
+            dispatch = asyncio.create_task(self._dispatch(batch))
+            self._dispatches.add(dispatch)
+            dispatch.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch):
+        rows = [row for row, _ in batch]
+        try:
+            results = await self.run_batch(rows)
+        except Exception as e:
+            if len(batch) == 1:
+                logger.error(f"Error running {self.name} prediction: {str(e)}")
+                _set_exception(batch[0][1], e)
+                return
+            # One bad row fails the whole batched call; retry the rows one at
+            # a time so only the offending caller gets the error
+            logger.warning(f"Error running {self.name} batch of {len(rows)}, retrying rows individually: {str(e)}")
+            for item in batch:
+                await self._dispatch([item])
+            return
+
+        for (_, future), result in zip(batch, results):
+            # The caller may have gone away (e.g. client disconnect)
+            if not future.done():
+                future.set_result(result)
+
+def _set_exception(future, exception):
+    if not future.done():
+        future.set_exception(exception)
@@ -0,0 +1,69 @@
+'''
+Export the batched scikit-learn models to ONNX so main.py can serve them
+through ONNX Runtime.
+
+Usage:
+    pip install -r ../requirements-onnx.txt
+    python convert_to_onnx.py [model ...]
+
+Each model is written next to its .sav file with an .onnx extension, and is
+picked up by main.py at startup when onnxruntime is installed. The exports
+use the ai.onnx.ml classifier operators (LinearClassifier for kidney,
+SVMClassifier/TreeEnsembleClassifier for breast), which keep float32 weights.
+'''
+import argparse
+import os
+
+import joblib
+from skl2onnx import convert_sklearn
+from skl2onnx.common.data_types import FloatTensorType
+
+current_dir = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(current_dir, 'saved_models')
+# Only the models main.py scores with predict_proba; diabetes is scored with
+# decision_function, which the ONNX export doesn't provide
+MODEL_FILES = {
+    "kidney": 'chronic_model.sav',
+    "breast": 'breast_cancer.sav',
+}
+
+def onnx_path(model_path):
+    return os.path.splitext(model_path)[0] + '.onnx'
+
+def convert(name):
+    model_path = os.path.join(MODEL_DIR, MODEL_FILES[name])
+    model = joblib.load(model_path)
+
+    # The serving path reads probabilities from the second ONNX output, which
+    # only exists for models with predict_proba
+    if not hasattr(model, 'predict_proba'):
+        print(f"Skipping {name}: model has no predict_proba")
+        return None
+
+    onnx_model = convert_sklearn(
+        model,
+        initial_types=[('X', FloatTensorType([None, model.n_features_in_]))],
+        # Return probabilities as a plain tensor instead of a list of dicts
+        options={'zipmap': False},
+    )
+    output_path = onnx_path(model_path)
+    with open(output_path, 'wb') as f:
+        f.write(onnx_model.SerializeToString())
+
+    print(f"Exported {name} model to {output_path}")
+    return output_path
+
+def main():
+    parser = argparse.ArgumentParser(description="Export saved models to ONNX")
+    parser.add_argument('models', nargs='*',
+                        help=f"models to export: {', '.join(MODEL_FILES)} (default: all)")
+    args = parser.parse_args()
+    unknown = [name for name in args.models if name not in MODEL_FILES]
+    if unknown:
+        parser.error(f"unknown model(s): {', '.join(unknown)}")
+
+    for name in args.models or MODEL_FILES:
+        convert(name)
+
+if __name__ == '__main__':
+    main()
@@ -1,14 +1,17 @@
 import xgboost as xgb
+import numpy as np
 import pandas as pd
+import logging
 import os
 
+logger = logging.getLogger(__name__)
+
 class DiseaseModel:
 
     def __init__(self):
         self.all_symptoms = None
-        self.symptoms = None
-        self.pred_disease = None
         self.model = xgb.XGBClassifier()
+        self.booster = None
         
         # Get the absolute path to the data directory
         current_dir = os.path.dirname(os.path.abspath(__file__))
@@ -18,12 +21,19 @@ class DiseaseModel:
         dataset_path = os.path.join(self.data_dir, 'dataset.csv')
         self.diseases = self.disease_list(dataset_path)
 
+        # Descriptions and precautions are read once and looked up per request
+        self.descriptions = self.disease_descriptions(os.path.join(self.data_dir, 'symptom_Description.csv'))
+        self.precautions = self.disease_precaution_lists(os.path.join(self.data_dir, 'symptom_precaution.csv'))
+
     def load_xgboost(self, model_path):
         try:
             self.model.load_model(model_path)
-            print(f"Successfully loaded model from {model_path}")
+            # Predict through the booster directly; inplace_predict takes numpy
+            # arrays without building a DMatrix on every call
+            self.booster = self.model.get_booster()
+            logger.info(f"Successfully loaded model from {model_path}")
         except Exception as e:
-            print(f"Error loading model: {str(e)}")
+            logger.error(f"Error loading model: {str(e)}")
             raise
 
     def save_xgboost(self, model_path):
@@ -31,65 +41,68 @@ class DiseaseModel:
 
     def predict(self, X):
         try:
-            self.symptoms = X
-            disease_pred_idx = self.model.predict(self.symptoms)
-            # Convert disease_pred_idx to integer for indexing
-            pred_idx = disease_pred_idx[0]
-            self.pred_disease = self.diseases[pred_idx]
-            disease_probability_array = self.model.predict_proba(self.symptoms)
-            disease_probability = disease_probability_array[0, pred_idx]
-            return self.pred_disease, disease_probability
+            # Nothing is stored on self: one instance serves concurrent requests
+            disease_probability_array = self.booster.inplace_predict(
+                np.asarray(X, dtype=np.float32)
+            )
+            # Convert the most likely class to integer for indexing
+            pred_idx = int(disease_probability_array[0].argmax())
+            pred_disease = self.diseases[pred_idx]
+            disease_probability = float(disease_probability_array[0, pred_idx])
+            return pred_disease, disease_probability
         except Exception as e:
-            print(f"Error during prediction: {str(e)}")
+            logger.error(f"Error during prediction: {str(e)}")
             raise
 
     def describe_disease(self, disease_name):
         if disease_name not in self.diseases:
             return "That disease is not contemplated in this model"
         
-        try:
-            # Read disease dataframe
-            desc_path = os.path.join(self.data_dir, 'symptom_Description.csv')
-            desc_df = pd.read_csv(desc_path)
-            desc_df = desc_df.apply(lambda col: col.str.strip())
-            return desc_df[desc_df['Disease'] == disease_name]['Description'].values[0]
-        except Exception as e:
-            print(f"Error getting disease description: {str(e)}")
+        description = self.descriptions.get(disease_name)
+        if description is None:
+            logger.error(f"No description found for {disease_name}")
             return "Description not available"
+        return description
 
-    def describe_predicted_disease(self):
-        if self.pred_disease is None:
-            return "No predicted disease yet"
-
-        return self.describe_disease(self.pred_disease)
-    
     def disease_precautions(self, disease_name):
         if disease_name not in self.diseases:
             return "That disease is not contemplated in this model"
 
-        try:
-            # Read precautions dataframe
-            prec_path = os.path.join(self.data_dir, 'symptom_precaution.csv')
-            prec_df = pd.read_csv(prec_path)
-            prec_df = prec_df.apply(lambda col: col.str.strip())
-            
-            # Get precautions for the disease
-            precautions = prec_df[prec_df['Disease'] == disease_name].iloc[0, 1:].tolist()
-            return [p for p in precautions if pd.notna(p)]
-        except Exception as e:
-            print(f"Error getting disease precautions: {str(e)}")
+        precautions = self.precautions.get(disease_name)
+        if precautions is None:
+            logger.error(f"No precautions found for {disease_name}")
             return ["Precautions not available"]
-
-    def predicted_disease_precautions(self):
-        if self.pred_disease is None:
-            return ["No predicted disease yet"]
-
-        return self.disease_precautions(self.pred_disease)
+        # Copy so callers can't modify the shared table
+        return list(precautions)
 
     def disease_list(self, dataset_path):
         try:
             df = pd.read_csv(dataset_path)
             return df['Disease'].unique()
         except Exception as e:
-            print(f"Error loading disease list: {str(e)}")
+            logger.error(f"Error loading disease list: {str(e)}")
             raise
+
+    def disease_descriptions(self, desc_path):
+        try:
+            desc_df = pd.read_csv(desc_path)
+            desc_df = desc_df.apply(lambda col: col.str.strip())
+            # Keep the first row per disease, as the per-request lookup did
+            desc_df = desc_df.drop_duplicates('Disease')
+            return dict(zip(desc_df['Disease'], desc_df['Description']))
+        except Exception as e:
+            logger.error(f"Error loading disease descriptions: {str(e)}")
+            return {}
+
+    def disease_precaution_lists(self, prec_path):
+        try:
+            prec_df = pd.read_csv(prec_path)
+            prec_df = prec_df.apply(lambda col: col.str.strip())
+            prec_df = prec_df.drop_duplicates('Disease')
+            return {
+                row[0]: [p for p in row[1:] if pd.notna(p)]
+                for row in prec_df.itertuples(index=False)
+            }
+        except Exception as e:
+            logger.error(f"Error loading disease precautions: {str(e)}")
+            return {}
@@ -1,25 +1,153 @@
 from fastapi import FastAPI, HTTPException
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, BeforeValidator, ConfigDict, Field, WithJsonSchema
+import anyio.to_thread
+import asyncio
 import joblib
+from cachetools import LRUCache
 import numpy as np
 import logging
+import math
+import multiprocessing
+import os
+import queue
+import threading
 import traceback
+from concurrent.futures import ProcessPoolExecutor, wait
+from functools import partial
+from logging.handlers import QueueHandler, QueueListener
+from typing import Annotated
 import pandas as pd
 
 # Use absolute imports instead of relative imports
 try:
     from helper import prepare_symptoms_array
     from disease_model import DiseaseModel
+    from batcher import MicroBatcher
     from routes import image_processing
 except ImportError:
     # Fallback for when running as a module
     from backend.helper import prepare_symptoms_array
     from backend.disease_model import DiseaseModel
+    from backend.batcher import MicroBatcher
     from backend.routes import image_processing
 
+# ONNX Runtime is optional; exported .onnx models are used only when it is installed
+try:
+    import onnxruntime  # noqa: F401
+except ImportError:
+    OnnxModel = None
+else:
+    try:
+        from onnx_model import OnnxModel
+    except ImportError:
+        from backend.onnx_model import OnnxModel
+
+try:
+    from numba import njit
+except ImportError:
+    # numba is optional; without it the jitted helpers run as plain Python
+    def njit(*args, **kwargs):
+        def decorator(func):
+            return func
+        return decorator
+
 logger = logging.getLogger(__name__)
 
+# Model artefacts live next to this file, independent of the working directory
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_DIR = os.path.join(BASE_DIR, 'saved_models')
+MODEL_PATHS = {
+    "diabetes": os.path.join(MODEL_DIR, 'diabetes_model.sav'),
+    "liver": os.path.join(MODEL_DIR, 'liver_model.sav'),
+    "kidney": os.path.join(MODEL_DIR, 'chronic_model.sav'),
+    "breast": os.path.join(MODEL_DIR, 'breast_cancer.sav'),
+    "general": os.path.join(MODEL_DIR, 'xgboost_model.json'),
+}
+
+# Models are loaded once at startup and shared by every request
+MODELS = {}
+
+# The heart and liver endpoints score inputs with fixed clinical weights and
+# never call a model. Heart isn't loaded at all; for liver, startup only checks
+# that the model file is there, since the endpoint reports it as missing
+LIVER_MODEL_FOUND = False
+
+# Column order the kidney and breast models were trained on
+KIDNEY_FEATURES = (
+    'age', 'bp', 'sg', 'al', 'su', 'rbc', 'pc', 'pcc', 'ba', 'bgr',
+    'bu', 'sc', 'sod', 'pot', 'hemo', 'pcv', 'wc', 'rc', 'htn',
+    'dm', 'cad', 'appet', 'pe', 'ane'
+)
+BREAST_FEATURES = (
+    'radius_mean', 'texture_mean', 'perimeter_mean', 'area_mean',
+    'smoothness_mean', 'compactness_mean', 'concavity_mean', 'concave points_mean',
+    'symmetry_mean', 'fractal_dimension_mean', 'radius_se', 'texture_se',
+    'perimeter_se', 'area_se', 'smoothness_se', 'compactness_se',
+    'concavity_se', 'concave points_se', 'symmetry_se', 'fractal_dimension_se',
+    'radius_worst', 'texture_worst', 'perimeter_worst', 'area_worst',
+    'smoothness_worst', 'compactness_worst', 'concavity_worst',
+    'concave points_worst', 'symmetry_worst', 'fractal_dimension_worst'
+)
+# Column indexes built once and shared by every template DataFrame
+KIDNEY_COLUMNS = pd.Index(KIDNEY_FEATURES)
+BREAST_COLUMNS = pd.Index(BREAST_FEATURES)
+
+# Models fitted on named columns, mapped to those columns. These are fed a
+# reusable DataFrame; every other model gets a plain array of the dtype in
+# its MODEL_META entry.
+FRAME_COLUMNS = {}
+
+# Concurrent single-row predictions for the same model are coalesced into
+# one model call of up to BATCH_MAX_SIZE rows, waiting at most BATCH_WAIT_MS
+# for a batch to fill
+BATCH_MAX_SIZE = int(os.getenv("BATCH_MAX_SIZE", 32))
+BATCH_WAIT_MS = float(os.getenv("BATCH_WAIT_MS", 5))
+
+# Scoring method used for each batched model
+SCORE_METHODS = {
+    "diabetes": "decision_function",
+    "kidney": "predict_proba",
+    "breast": "predict_proba",
+}
+BATCHERS = {}
+
+# Bound predict/scoring methods of the batched models, resolved once at
+# startup so the hot path doesn't probe the model per request
+MODEL_META = {}
+
+# Set LOG_LEVEL (e.g. DEBUG) to emit the backend's own logs. Records are
+# handed to a background thread through a queue, so request handlers never
+# block on log I/O.
+LOG_LEVEL = os.getenv("LOG_LEVEL")
+_log_listener = None
+_log_handler = None
+
+# Model outputs for recently seen inputs, keyed by model name and the input
+# rounded to PREDICTION_CACHE_DECIMALS places. PREDICTION_CACHE_SIZE=0
+# disables caching. Each worker has its own cache, which only lives as long
+# as the models it was filled from: restart the server after replacing a
+# model file.
+PREDICTION_CACHE_SIZE = int(os.getenv("PREDICTION_CACHE_SIZE", 2048))
+PREDICTION_CACHE_DECIMALS = 4
+PREDICTION_CACHE = LRUCache(maxsize=max(PREDICTION_CACHE_SIZE, 1))
+
+# Serve a batched model from its ONNX export (see convert_to_onnx.py) when
+# one exists next to the .sav file
+USE_ONNX = os.getenv("USE_ONNX", "1") != "0"
+
+# Set INFERENCE_PROCESSES to run model calls on a pool of that many worker
+# processes, each with its own copy of the models, instead of the threadpool.
+# This sidesteps the GIL at the cost of one model set per process.
+INFERENCE_PROCESSES = int(os.getenv("INFERENCE_PROCESSES", 0))
+INFERENCE_POOL = None
+
+# Upper bound on concurrent model calls; sklearn work is CPU-bound, so more
+# threads than cores only adds contention
+INFERENCE_THREADS = int(os.getenv("INFERENCE_THREADS", os.cpu_count() or 1))
+
+# Responses are serialized through each route's response_model
 app = FastAPI()
 
 # Add CORS middleware
@@ -45,10 +173,11 @@ class DiabetesInput(BaseModel):
     DiabetesPedigreeFunction: float
     Age: float
 
-    class Config:
-        allow_population_by_field_name = True
+    model_config = ConfigDict(populate_by_name=True, allow_inf_nan=False)
 
 class HeartInput(BaseModel):
+    model_config = ConfigDict(allow_inf_nan=False)
+
     age: float
     sex: float
     cp: float
@@ -75,8 +204,7 @@ class LiverInput(BaseModel):
     albumin: float
     albumin_globulin_ratio: float
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True, allow_inf_nan=False)
 
 class ParkinsonsInput(BaseModel):
     fo: float = Field(..., alias="Fo")
@@ -102,13 +230,14 @@ class ParkinsonsInput(BaseModel):
     d2: float = Field(..., alias="D2")
     ppe: float = Field(..., alias="PPE")
 
-    class Config:
-        populate_by_name = True
+    model_config = ConfigDict(populate_by_name=True, allow_inf_nan=False)
 
 class GeneralInput(BaseModel):
     symptoms: list[str]
 
 class LungInput(BaseModel):
+    model_config = ConfigDict(allow_inf_nan=False)
+
     gender: str  # M/F
     age: int
     smoking: int
@@ -125,16 +254,40 @@ class LungInput(BaseModel):
     swallowing_difficulty: int
     chest_pain: int
 
+def categorical(positive: str, negative: str):
+    """
+    Field type for a categorical chronic kidney disease field. Only the two
+    strings are accepted, and they are encoded as 1.0/0.0 while the request is
+    validated, so the handler only ever sees numbers.
+    """
+    encoding = {positive: 1.0, negative: 0.0}
+
+    def encode(value):
+        if not isinstance(value, str) or value.lower() not in encoding:
+            raise ValueError(f"must be one of {positive}, {negative}")
+        return encoding[value.lower()]
+
+    return Annotated[
+        float,
+        BeforeValidator(encode),
+        WithJsonSchema({"type": "string", "enum": [positive, negative]}),
+    ]
+
+NormalAbnormal = categorical('normal', 'abnormal')
+PresentNotPresent = categorical('present', 'notpresent')
+YesNo = categorical('yes', 'no')
+GoodPoor = categorical('good', 'poor')
+
 class ChronicKidneyInput(BaseModel):
     age: float
     bp: float
     sg: float
     al: float
     su: float
-    rbc: str  # normal/abnormal
-    pc: str  # normal/abnormal
-    pcc: str  # present/notpresent
-    ba: str  # present/notpresent
+    rbc: NormalAbnormal
+    pc: NormalAbnormal
+    pcc: PresentNotPresent
+    ba: PresentNotPresent
     bgr: float
     bu: float
     sc: float
@@ -144,15 +297,16 @@ class ChronicKidneyInput(BaseModel):
     pcv: float
     wc: float
     rc: float
-    htn: str  # yes/no
-    dm: str  # yes/no
-    cad: str  # yes/no
-    appet: str  # good/poor
-    pe: str  # yes/no
-    ane: str  # yes/no
-
-    class Config:
-        schema_extra = {
+    htn: YesNo
+    dm: YesNo
+    cad: YesNo
+    appet: GoodPoor
+    pe: YesNo
+    ane: YesNo
+
+    model_config = ConfigDict(
+        allow_inf_nan=False,
+        json_schema_extra={
             "example": {
                 "age": 48,
                 "bp": 80,
@@ -180,8 +334,11 @@ class ChronicKidneyInput(BaseModel):
                 "ane": "no"
             }
         }
+    )
 
 class BreastCancerInput(BaseModel):
+    model_config = ConfigDict(allow_inf_nan=False)
+
     radius_mean: float
     texture_mean: float
     perimeter_mean: float
@@ -213,41 +370,290 @@ class BreastCancerInput(BaseModel):
     symmetry_worst: float
     fractal_dimension_worst: float
 
-def load_heart_model():
+# Pydantic models for responses
+class PredictionResponse(BaseModel):
+    prediction: bool
+    probability: float
+    risk_level: str
+
+class GeneralPredictionResponse(BaseModel):
+    prediction: str
+    probability: float
+    description: str
+    precautions: list[str]
+
+def load_sklearn_model(name: str):
+    """Load a joblib-pickled estimator, returning None if it is unavailable."""
+    model_path = MODEL_PATHS[name]
+    if not os.path.exists(model_path):
+        logger.warning(f"{name} model file not found at {model_path}")
+        return None
     try:
-        logger.info("Loading heart disease model...")
-        import os
-        model_path = os.path.join(os.path.dirname(__file__), 'saved_models/heart_disease_model.sav')
-        
-        # Check if model file exists
-        if not os.path.exists(model_path):
-            # For testing, return a mock model
-            logger.warning(f"Heart model file not found at {model_path}, returning mock model")
-            from sklearn.ensemble import RandomForestClassifier
-            model = RandomForestClassifier()
-            # This mock model will always predict 1 with 0.75 probability
-            model.predict = lambda X: np.ones(X.shape[0], dtype=int)
-            model.predict_proba = lambda X: np.array([[0.25, 0.75]] * X.shape[0])
+        return joblib.load(model_path)
+    except Exception as e:
+        logger.error(f"Error loading {name} model: {str(e)}")
+        return None
+
+def load_batched_model(name: str):
+    """Load a batched model, preferring its ONNX export over the joblib pickle."""
+    onnx_path = os.path.splitext(MODEL_PATHS[name])[0] + '.onnx'
+    # OnnxModel only returns labels and probabilities, so models scored with
+    # anything else (e.g. diabetes' decision_function) stay on joblib
+    if (USE_ONNX and OnnxModel is not None and SCORE_METHODS[name] == "predict_proba"
+            and os.path.exists(onnx_path)):
+        try:
+            model = OnnxModel(onnx_path)
+            logger.info(f"Serving {name} model from {onnx_path}")
             return model
-            
-        model_data = joblib.load(model_path)
-        # If model is returned as a tuple (scaler, model), separate them
-        if isinstance(model_data, tuple):
-            scaler, model = model_data
-        else:
-            model = model_data
-            scaler = None  # We'll handle this case in prediction
-        logger.info("Model loaded successfully")
+        except Exception as e:
+            logger.error(f"Error loading {name} ONNX model, falling back to joblib: {str(e)}")
+    return load_sklearn_model(name)
+
+def load_general_model():
+    try:
+        model = DiseaseModel()
+        model.load_xgboost(MODEL_PATHS["general"])
         return model
     except Exception as e:
-        logger.error(f"Error loading heart disease model: {str(e)}")
-        logger.warning("Returning mock model due to error")
-        # Return a mock model in case of error
-        from sklearn.ensemble import RandomForestClassifier
-        model = RandomForestClassifier()
-        model.predict = lambda X: np.ones(X.shape[0], dtype=int)
-        model.predict_proba = lambda X: np.array([[0.25, 0.75]] * X.shape[0])
-        return model
+        logger.error(f"Error loading general disease model: {str(e)}")
+        return None
+
+@app.on_event("startup")
+def configure_logging():
+    global _log_listener, _log_handler
+    if not LOG_LEVEL:
+        return
+    # getLevelName maps a registered level name to its number; anything else
+    # would make setLevel raise and stop the app from booting
+    level = logging.getLevelName(LOG_LEVEL.upper())
+    invalid_level = not isinstance(level, int)
+    if invalid_level:
+        level = logging.INFO
+
+    log_queue = queue.SimpleQueue()
+    handler = logging.StreamHandler()
+    handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    _log_listener = QueueListener(log_queue, handler)
+    _log_listener.start()
+
+    _log_handler = QueueHandler(log_queue)
+    root_logger = logging.getLogger()
+    root_logger.addHandler(_log_handler)
+    root_logger.setLevel(level)
+    if invalid_level:
+        logger.warning(f"Unknown LOG_LEVEL {LOG_LEVEL!r}, logging at INFO")
+
+@app.on_event("startup")
+def load_models():
+    global LIVER_MODEL_FOUND
+    logger.info("Loading models...")
+    MODELS["diabetes"] = load_batched_model("diabetes")
+    LIVER_MODEL_FOUND = os.path.exists(MODEL_PATHS["liver"])
+    if not LIVER_MODEL_FOUND:
+        logger.warning(f"Liver model file not found at {MODEL_PATHS['liver']}")
+    MODELS["kidney"] = load_batched_model("kidney")
+    MODELS["breast"] = load_batched_model("breast")
+    MODELS["general"] = load_general_model()
+    resolve_model_meta()
+    PREDICTION_CACHE.clear()
+    logger.info(f"Models loaded: {[name for name, model in MODELS.items() if model is not None]}")
+
+def resolve_model_meta():
+    """Fill MODEL_META and FRAME_COLUMNS for the loaded batched models."""
+    for name, score_method in SCORE_METHODS.items():
+        model = MODELS[name]
+        if model is None:
+            continue
+        MODEL_META[name] = {
+            "predict": model.predict,
+            "score": getattr(model, score_method, None),
+            # ONNX models produce labels and probabilities in one run
+            "predict_scores": getattr(model, "predict_with_proba", None),
+            # ONNX Runtime takes float32; scikit-learn estimators keep float64
+            # so large inputs don't overflow
+            "dtype": np.float32 if OnnxModel is not None and isinstance(model, OnnxModel) else np.float64,
+        }
+        if MODEL_META[name]["score"] is None:
+            logger.warning(f"{name} model has no {score_method}")
+
+    for name, columns in (("kidney", KIDNEY_COLUMNS), ("breast", BREAST_COLUMNS)):
+        if hasattr(MODELS[name], "feature_names_in_"):
+            FRAME_COLUMNS[name] = columns
+            logger.info(f"Feature names being used for {name}: {columns.tolist()}")
+
+@app.on_event("startup")
+async def configure_threadpool():
+    anyio.to_thread.current_default_thread_limiter().total_tokens = INFERENCE_THREADS
+    logger.info(f"Inference threadpool limited to {INFERENCE_THREADS} threads")
+
+def _preload_models():
+    """
+    Process pool initializer: load the worker's own copy of the models that
+    run in the pool, i.e. the batched models and the general disease model.
+    """
+    for name in SCORE_METHODS:
+        MODELS[name] = load_batched_model(name)
+    MODELS["general"] = load_general_model()
+    resolve_model_meta()
+
+def _pool_ready():
+    """No-op submitted at startup so the pool workers are spawned up front."""
+
+@app.on_event("startup")
+def start_inference_pool():
+    global INFERENCE_POOL
+    if INFERENCE_PROCESSES <= 0:
+        return
+    # Spawn rather than fork, so workers don't inherit the server's threads
+    INFERENCE_POOL = ProcessPoolExecutor(
+        max_workers=INFERENCE_PROCESSES,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_preload_models,
+    )
+    # Workers start lazily, so without this the first batch would wait for a
+    # worker to spawn and load its models
+    wait([INFERENCE_POOL.submit(_pool_ready) for _ in range(INFERENCE_PROCESSES)])
+    logger.info(f"Running inference on {INFERENCE_PROCESSES} worker processes")
+
+async def run_inference(func, *args):
+    """Run a model call on the process pool if there is one, else on the threadpool."""
+    if INFERENCE_POOL is not None:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(INFERENCE_POOL, func, *args)
+    return await run_in_threadpool(func, *args)
+
+@app.on_event("startup")
+async def start_batchers():
+    for name in SCORE_METHODS:
+        if MODELS.get(name) is None:
+            continue
+        batcher = MicroBatcher(
+            name,
+            partial(run_inference, _predict_batch_sync, name),
+            max_batch=BATCH_MAX_SIZE,
+            max_wait_ms=BATCH_WAIT_MS,
+        )
+        batcher.start()
+        BATCHERS[name] = batcher
+
+@app.on_event("shutdown")
+async def stop_batchers():
+    for batcher in BATCHERS.values():
+        await batcher.stop()
+    BATCHERS.clear()
+
+@app.on_event("shutdown")
+def stop_inference_pool():
+    global INFERENCE_POOL
+    if INFERENCE_POOL is not None:
+        INFERENCE_POOL.shutdown(cancel_futures=True)
+        INFERENCE_POOL = None
+
+# Registered after the other shutdown handlers so their logs are still written
+@app.on_event("shutdown")
+def stop_logging():
+    global _log_listener, _log_handler
+    if _log_handler is not None:
+        logging.getLogger().removeHandler(_log_handler)
+        _log_handler = None
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+# Per-thread reusable input batches, one attribute per model name.
+# Each threadpool worker fills its own buffer, so concurrent batches never
+# share one.
+_FEATURE_BUFFERS = threading.local()
+
+def _feature_buffer(name: str, n_features: int, dtype) -> np.ndarray:
+    buffer = getattr(_FEATURE_BUFFERS, name, None)
+    if buffer is None:
+        buffer = np.empty((BATCH_MAX_SIZE, n_features), dtype=dtype)
+        setattr(_FEATURE_BUFFERS, name, buffer)
+    return buffer
+
+# Per-thread reusable template DataFrames for models in FRAME_COLUMNS
+_FEATURE_FRAMES = threading.local()
+
+def _feature_frame(name: str, columns: pd.Index) -> pd.DataFrame:
+    frame = getattr(_FEATURE_FRAMES, name, None)
+    if frame is None:
+        frame = pd.DataFrame(np.empty((BATCH_MAX_SIZE, len(columns))), columns=columns)
+        setattr(_FEATURE_FRAMES, name, frame)
+    return frame
+
+def _predict_batch_sync(name: str, rows):
+    """
+    Fill this thread's buffer for ``name`` with a batch of rows and run
+    ``predict`` and the model's scoring method on it in the same threadpool
+    hop. Returns a (prediction, scores) pair per row; the scores are None if
+    the model has no scoring method.
+    """
+    n_rows = len(rows)
+    meta = MODEL_META[name]
+    columns = FRAME_COLUMNS.get(name)
+    if columns is not None:
+        frame = _feature_frame(name, columns)
+        frame.iloc[:n_rows, :] = rows
+        features = frame if n_rows == len(frame) else frame.iloc[:n_rows]
+    else:
+        features = _feature_buffer(name, len(rows[0]), meta["dtype"])[:n_rows]
+        features[:] = rows
+    if meta["predict_scores"] is not None:
+        return list(zip(*meta["predict_scores"](features)))
+    predictions = meta["predict"](features)
+    if meta["score"] is None:
+        return [(prediction, None) for prediction in predictions]
+    return list(zip(predictions, meta["score"](features)))
+
+RISK_LEVELS = ("Low", "Medium", "High")
+
+@njit(cache=True)
+def _score_to_risk(score):
+    """
+    Squash a decision score into a probability-like value and classify it in
+    one compiled call. Returns the probability and an index into RISK_LEVELS,
+    using the same thresholds as get_risk_level.
+    """
+    # Numerically stable sigmoid
+    if score >= 0:
+        probability = 1.0 / (1.0 + math.exp(-score))
+    else:
+        exp_score = math.exp(score)
+        probability = exp_score / (1.0 + exp_score)
+
+    if probability >= 0.7:
+        return probability, 2
+    elif probability >= 0.3:
+        return probability, 1
+    return probability, 0
+
+@app.on_event("startup")
+def compile_score_to_risk():
+    # Compile (or load from numba's cache) up front rather than on the first
+    # diabetes request
+    _score_to_risk(0.0)
+
+def _predict_general_sync(features):
+    # Looks the model up by name so only the features cross a process boundary
+    return MODELS["general"].predict(features)
+
+async def predict_cached(name: str, features):
+    """
+    Return the (prediction, scores) pair for a batched model, reusing the
+    cached result for an input seen recently.
+    """
+    key = (name, tuple(round(value, PREDICTION_CACHE_DECIMALS) for value in features))
+    result = PREDICTION_CACHE.get(key)
+    if result is None:
+        result = await BATCHERS[name].submit(features)
+        if PREDICTION_CACHE_SIZE > 0:
+            PREDICTION_CACHE[key] = result
+    return result
+
+def _clamp4(probability: float) -> float:
+    """Clamp a probability to [0, 1] and round it to 4 decimal places."""
+    return round(min(1.0, max(0.0, probability)), 4)
 
 def get_risk_level(probability: float) -> str:
     if probability >= 0.7:  # 70% or higher
@@ -261,69 +667,48 @@ def get_risk_level(probability: float) -> str:
 async def root():
     return {"message": "Disease Prediction API is running"}
 
-@app.post("/predict/diabetes")
+@app.post("/predict/diabetes", response_model=PredictionResponse)
 async def predict_diabetes(data: DiabetesInput):
     try:
-        logger.info("Loading model...")
-        # Use a relative path that works regardless of where the script is run from
-        import os
-        model_path = os.path.join(os.path.dirname(__file__), 'saved_models/diabetes_model.sav')
-        
-        # Check if model file exists
-        if not os.path.exists(model_path):
-            # For testing, return a mock prediction if model doesn't exist
-            logger.warning(f"Model file not found at {model_path}, returning mock prediction")
+        model = MODELS.get("diabetes")
+        if model is None:
+            # For testing, return a mock prediction if model isn't available
+            logger.warning("Diabetes model not loaded, returning mock prediction")
             return {
                 "prediction": True,
                 "risk_level": "Medium",
                 "probability": 0.75
             }
-            
-        model = joblib.load(model_path)
         
-        print(f"Preparing features with data: {data}")
-        features = np.array([[
+        features = (
             data.Pregnancies, data.Glucose, data.BloodPressure, data.SkinThickness,
             data.Insulin, data.BMI, data.DiabetesPedigreeFunction, data.Age
-        ]])
-        print(f"Features shape: {features.shape}")
-        
-        print("Making prediction...")
-        prediction = model.predict(features)
+        )
         
         # Since probability is not available, we'll use decision_function as a proxy
-        decision_score = model.decision_function(features)[0]
+        prediction, decision_score = await predict_cached("diabetes", features)
+        if decision_score is None:
+            raise ValueError("Diabetes model did not return a decision score")
         # Convert decision score to a probability-like value between 0 and 1
-        probability = 1 / (1 + np.exp(-decision_score))
+        probability, risk_code = _score_to_risk(float(decision_score))
+        risk_level = RISK_LEVELS[risk_code]
         
-        print(f"Prediction: {prediction}, Score: {decision_score}, Probability: {probability}")
-        risk_level = get_risk_level(probability)
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Diabetes prediction: {prediction}, Score: {decision_score}, Probability: {probability}")
         
         return {
-            "prediction": bool(prediction[0]),
+            "prediction": bool(prediction),
             "probability": float(probability),
             "risk_level": risk_level
         }
     except Exception as e:
-        print(f"Error in predict_diabetes: {str(e)}")
-        import traceback
-        print(f"Traceback: {traceback.format_exc()}")
+        logger.error(f"Error in predict_diabetes: {str(e)}")
+        logger.error(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/predict/heart")
+@app.post("/predict/heart", response_model=PredictionResponse)
 async def predict_heart(data: HeartInput):
     try:
-        # Load model
-        model = load_heart_model()
-        
-        # Convert input data to feature array
-        features = np.array([[
-            data.age, data.sex, data.cp, data.trestbps, data.chol,
-            data.fbs, data.restecg, data.thalach, data.exang,
-            data.oldpeak, data.slope, data.ca, data.thal
-        ]])
-        logger.info(f"Features shape: {features.shape}")
-        
         # Calculate a prediction score based on key risk factors
         # These weights are based on clinical importance of each factor
         age_score = float(data.age) / 100  # Age normalized
@@ -387,8 +772,9 @@ async def predict_heart(data: HeartInput):
                 probability = max(0.05, min(0.45, raw_probability))
         
         # Log the prediction details
-        logger.info(f"Heart disease prediction: {prediction}, Probability: {probability}")
-        logger.info(f"Input features: age={data.age}, sex={data.sex}, cp={data.cp}, trestbps={data.trestbps}, chol={data.chol}, fbs={data.fbs}, restecg={data.restecg}, thalach={data.thalach}, exang={data.exang}, oldpeak={data.oldpeak}, slope={data.slope}, ca={data.ca}, thal={data.thal}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Heart disease prediction: {prediction}, Probability: {probability}")
+            logger.debug(f"Input features: age={data.age}, sex={data.sex}, cp={data.cp}, trestbps={data.trestbps}, chol={data.chol}, fbs={data.fbs}, restecg={data.restecg}, thalach={data.thalach}, exang={data.exang}, oldpeak={data.oldpeak}, slope={data.slope}, ca={data.ca}, thal={data.thal}")
         
         # Determine risk level based on probability
         risk_level = get_risk_level(probability)
@@ -403,17 +789,10 @@ async def predict_heart(data: HeartInput):
         logger.error(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/predict/liver")
+@app.post("/predict/liver", response_model=PredictionResponse)
 async def predict_liver(data: LiverInput):
     try:
-        logger.info("Loading liver disease model...")
-        # Use absolute path to the model file with correct filename
-        import os
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        model_path = os.path.join(current_dir, 'saved_models', 'liver_model.sav')
-        
-        # Check if model file exists
-        if not os.path.exists(model_path):
+        if not LIVER_MODEL_FOUND:
             raise HTTPException(status_code=500, detail="Liver model file not found")
         
         # Calculate a prediction score based on key liver disease indicators
@@ -497,8 +876,9 @@ async def predict_liver(data: LiverInput):
                 probability = max(0.05, min(0.45, raw_probability))
         
         # Log the prediction details
-        logger.info(f"Liver disease prediction: {prediction}, Probability: {probability}")
-        logger.info(f"Input features: age={data.age}, gender={data.gender}, total_bilirubin={data.total_bilirubin}, direct_bilirubin={data.direct_bilirubin}, alkaline_phosphotase={data.alkaline_phosphotase}, alamine_aminotransferase={data.alamine_aminotransferase}, aspartate_aminotransferase={data.aspartate_aminotransferase}, total_proteins={data.total_proteins}, albumin={data.albumin}, albumin_globulin_ratio={data.albumin_globulin_ratio}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Liver disease prediction: {prediction}, Probability: {probability}")
+            logger.debug(f"Input features: age={data.age}, gender={data.gender}, total_bilirubin={data.total_bilirubin}, direct_bilirubin={data.direct_bilirubin}, alkaline_phosphotase={data.alkaline_phosphotase}, alamine_aminotransferase={data.alamine_aminotransferase}, aspartate_aminotransferase={data.aspartate_aminotransferase}, total_proteins={data.total_proteins}, albumin={data.albumin}, albumin_globulin_ratio={data.albumin_globulin_ratio}")
         
         # Determine risk level based on probability
         risk_level = get_risk_level(probability)
@@ -513,27 +893,16 @@ async def predict_liver(data: LiverInput):
         logger.error(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/predict/parkinsons")
+@app.post("/predict/parkinsons", response_model=PredictionResponse)
 async def predict_parkinsons(data: ParkinsonsInput):
     try:
-        logger.info("Loading Parkinson's disease model...")
-        
-        # Extract features from input data
-        features = np.array([[
-            data.fo, data.fhi, data.flo, data.jitter_percent,
-            data.jitter_abs, data.rap, data.ppq, data.ddp,
-            data.shimmer, data.shimmer_db, data.apq3, data.apq5,
-            data.apq, data.dda, data.nhr, data.hnr, data.rpde,
-            data.dfa, data.spread1, data.spread2, data.d2, data.ppe
-        ]])
-        logger.info(f"Features shape: {features.shape}")
-        
         # Log all input values for debugging
-        logger.info(f"Input values: fo={data.fo}, fhi={data.fhi}, flo={data.flo}, jitter_percent={data.jitter_percent}, "
-                   f"jitter_abs={data.jitter_abs}, rap={data.rap}, ppq={data.ppq}, ddp={data.ddp}, "
-                   f"shimmer={data.shimmer}, shimmer_db={data.shimmer_db}, apq3={data.apq3}, apq5={data.apq5}, "
-                   f"apq={data.apq}, dda={data.dda}, nhr={data.nhr}, hnr={data.hnr}, rpde={data.rpde}, "
-                   f"dfa={data.dfa}, spread1={data.spread1}, spread2={data.spread2}, d2={data.d2}, ppe={data.ppe}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Input values: fo={data.fo}, fhi={data.fhi}, flo={data.flo}, jitter_percent={data.jitter_percent}, "
+                       f"jitter_abs={data.jitter_abs}, rap={data.rap}, ppq={data.ppq}, ddp={data.ddp}, "
+                       f"shimmer={data.shimmer}, shimmer_db={data.shimmer_db}, apq3={data.apq3}, apq5={data.apq5}, "
+                       f"apq={data.apq}, dda={data.dda}, nhr={data.nhr}, hnr={data.hnr}, rpde={data.rpde}, "
+                       f"dfa={data.dfa}, spread1={data.spread1}, spread2={data.spread2}, d2={data.d2}, ppe={data.ppe}")
         
         # Generate a probability directly based on key indicators
         # These values are based on clinical literature about Parkinson's disease voice analysis
@@ -574,7 +943,8 @@ async def predict_parkinsons(data: ParkinsonsInput):
         # Determine risk level
         risk_level = get_risk_level(probability)
         
-        logger.info(f"Parkinson's prediction: {prediction}, Probability: {probability}, Risk Level: {risk_level}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Parkinson's prediction: {prediction}, Probability: {probability}, Risk Level: {risk_level}")
         
         return {
             "prediction": bool(prediction),
@@ -586,8 +956,8 @@ async def predict_parkinsons(data: ParkinsonsInput):
         logger.error(f"Traceback: {traceback.format_exc()}")
         
         # Fallback to a random prediction if there's an error
-        prediction = np.random.choice([True, False], p=[0.4, 0.6])
-        probability = np.random.uniform(0.65, 0.95) if prediction else np.random.uniform(0.05, 0.35)
+        prediction = bool(np.random.choice([True, False], p=[0.4, 0.6]))
+        probability = float(np.random.uniform(0.65, 0.95) if prediction else np.random.uniform(0.05, 0.35))
         risk_level = get_risk_level(probability)
         
         logger.info(f"Fallback Parkinson's prediction: {prediction}, Probability: {probability}, Risk Level: {risk_level}")
@@ -598,14 +968,9 @@ async def predict_parkinsons(data: ParkinsonsInput):
             "risk_level": risk_level
         }
 
-@app.post("/predict/lung")
+@app.post("/predict/lung", response_model=PredictionResponse)
 async def predict_lung(data: LungInput):
     try:
-        logger.info("Loading lung cancer model...")
-        import os
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        model_path = os.path.join(current_dir, 'saved_models', 'lung_cancer_model.sav')
-        
         # Calculate a prediction score based on key lung cancer indicators
         # These weights are based on clinical importance of each factor
         
@@ -698,8 +1063,9 @@ async def predict_lung(data: LungInput):
                 probability = max(0.05, min(0.45, raw_probability))
         
         # Log the prediction details
-        logger.info(f"Lung cancer prediction: {prediction}, Probability: {probability}")
-        logger.info(f"Input features: gender={data.gender}, age={data.age}, smoking={data.smoking}, yellow_fingers={data.yellow_fingers}, anxiety={data.anxiety}, peer_pressure={data.peer_pressure}, chronic_disease={data.chronic_disease}, fatigue={data.fatigue}, allergy={data.allergy}, wheezing={data.wheezing}, alcohol_consuming={data.alcohol_consuming}, coughing={data.coughing}, shortness_of_breath={data.shortness_of_breath}, swallowing_difficulty={data.swallowing_difficulty}, chest_pain={data.chest_pain}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f"Lung cancer prediction: {prediction}, Probability: {probability}")
+            logger.debug(f"Input features: gender={data.gender}, age={data.age}, smoking={data.smoking}, yellow_fingers={data.yellow_fingers}, anxiety={data.anxiety}, peer_pressure={data.peer_pressure}, chronic_disease={data.chronic_disease}, fatigue={data.fatigue}, allergy={data.allergy}, wheezing={data.wheezing}, alcohol_consuming={data.alcohol_consuming}, coughing={data.coughing}, shortness_of_breath={data.shortness_of_breath}, swallowing_difficulty={data.swallowing_difficulty}, chest_pain={data.chest_pain}")
         
         # Determine risk level based on probability
         risk_level = get_risk_level(probability)
@@ -714,100 +1080,46 @@ async def predict_lung(data: LungInput):
         logger.error(f"Traceback: {traceback.format_exc()}")
         raise HTTPException(status_code=500, detail=str(e))
 
-@app.post("/predict/kidney")
+@app.post("/predict/kidney", response_model=PredictionResponse)
 async def predict_kidney(data: ChronicKidneyInput):
     try:
-        logger.info("Loading chronic kidney disease model...")
-        # Use absolute path to the model file
-        import os
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        model_path = os.path.join(current_dir, 'saved_models', 'chronic_model.sav')
-        model = joblib.load(model_path)
-        
-        # Convert categorical variables
-        categorical_map = {
-            'yes': 1, 'no': 0,
-            'present': 1, 'notpresent': 0,
-            'normal': 1, 'abnormal': 0,
-            'good': 1, 'poor': 0
-        }
-        
-        # Define expected feature names and order
-        feature_names = [
-            'age', 'bp', 'sg', 'al', 'su', 'rbc', 'pc', 'pcc', 'ba', 'bgr',
-            'bu', 'sc', 'sod', 'pot', 'hemo', 'pcv', 'wc', 'rc', 'htn',
-            'dm', 'cad', 'appet', 'pe', 'ane'
-        ]
+        model = MODELS.get("kidney")
+        if model is None:
+            raise RuntimeError("Chronic kidney disease model is not loaded")
+        
+        # Feature values in KIDNEY_FEATURES order; categorical fields are
+        # already encoded by ChronicKidneyInput
+        features = (
+            data.age, data.bp, data.sg, data.al, data.su, data.rbc, data.pc, data.pcc,
+            data.ba, data.bgr, data.bu, data.sc, data.sod, data.pot, data.hemo, data.pcv,
+            data.wc, data.rc, data.htn, data.dm, data.cad, data.appet, data.pe, data.ane
+        )
         
         try:
-            # Create feature dictionary with consistent ordering
-            feature_dict = {
-                'age': float(data.age),
-                'bp': float(data.bp),
-                'sg': float(data.sg),
-                'al': float(data.al),
-                'su': float(data.su),
-                'rbc': categorical_map[data.rbc.lower()],
-                'pc': categorical_map[data.pc.lower()],
-                'pcc': categorical_map[data.pcc.lower()],
-                'ba': categorical_map[data.ba.lower()],
-                'bgr': float(data.bgr),
-                'bu': float(data.bu),
-                'sc': float(data.sc),
-                'sod': float(data.sod),
-                'pot': float(data.pot),
-                'hemo': float(data.hemo),
-                'pcv': float(data.pcv),
-                'wc': float(data.wc),
-                'rc': float(data.rc),
-                'htn': categorical_map[data.htn.lower()],
-                'dm': categorical_map[data.dm.lower()],
-                'cad': categorical_map[data.cad.lower()],
-                'appet': categorical_map[data.appet.lower()],
-                'pe': categorical_map[data.pe.lower()],
-                'ane': categorical_map[data.ane.lower()]
-            }
-
-            # Create DataFrame with specific column order
-            features = pd.DataFrame([feature_dict])
+            # Get prediction and probability
+            prediction, probabilities = await predict_cached("kidney", features)
+            if probabilities is None:
+                raise ValueError("Kidney model did not return probabilities")
+            raw_probability = float(probabilities[1])
+            probability = _clamp4(raw_probability)
             
-            # Ensure columns are in the correct order
-            features = features[feature_names]
+            # Determine risk level based on probability
+            risk_level = get_risk_level(probability)
             
-            logger.info(f"Feature names being used: {feature_names}")
-            logger.info(f"Feature shape: {features.shape}")
-            logger.info(f"Feature columns: {features.columns.tolist()}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Prediction successful. Result: {prediction}, Risk Level: {risk_level}, Probability: {probability}")
             
-            try:
-                # Get prediction and probability
-                prediction = model.predict(features)[0]
-                raw_probability = float(model.predict_proba(features)[0][1])
-                probability = float(format(max(0.0, min(1.0, raw_probability)), '.4f'))  # Clamp between 0 and 1
-                
-                # Determine risk level based on probability
-                risk_level = get_risk_level(probability)
-                
-                logger.info(f"Prediction successful. Result: {prediction}, Risk Level: {risk_level}, Probability: {probability}")
-                
-                return {
-                    "prediction": bool(prediction),
-                    "risk_level": risk_level,
-                    "probability": probability
-                }
-            except Exception as model_error:
-                logger.error(f"Model prediction error: {str(model_error)}")
-                logger.error(f"Feature shape: {features.shape}")
-                logger.error(f"Feature columns: {features.columns.tolist()}")
-                raise HTTPException(
-                    status_code=500,
-                    detail="Error during prediction. Please ensure all input values are valid."
-                )
-
-        except (ValueError, KeyError) as e:
-            logger.error(f"Value conversion error: {str(e)}")
+            return {
+                "prediction": bool(prediction),
+                "risk_level": risk_level,
+                "probability": probability
+            }
+        except Exception as model_error:
+            logger.error(f"Model prediction error: {str(model_error)}")
+            logger.error(f"Feature values: {features}")
             raise HTTPException(
-                status_code=400,
-                detail="Invalid input values. Please check the format of all fields."
+                status_code=500,
+                detail="Error during prediction. Please ensure all input values are valid."
             )
 
     except Exception as e:
@@ -818,135 +1130,82 @@ async def predict_kidney(data: ChronicKidneyInput):
             detail="An unexpected error occurred. Please try again later."
         )
 
-@app.post("/predict/breast")
+@app.post("/predict/breast", response_model=PredictionResponse)
 async def predict_breast(data: BreastCancerInput):
     try:
-        logger.info("Loading breast cancer model...")
-        # Use absolute path to the model file
-        import os
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        model_path = os.path.join(current_dir, 'saved_models', 'breast_cancer.sav')
-        model = joblib.load(model_path)
+        model = MODELS.get("breast")
+        if model is None:
+            raise RuntimeError("Breast cancer model is not loaded")
+        
+        # Feature values in BREAST_FEATURES order, the exact feature names used during model training
+        features = (
+            data.radius_mean, data.texture_mean, data.perimeter_mean, data.area_mean,
+            data.smoothness_mean, data.compactness_mean, data.concavity_mean, data.concave_points_mean,
+            data.symmetry_mean, data.fractal_dimension_mean, data.radius_se, data.texture_se,
+            data.perimeter_se, data.area_se, data.smoothness_se, data.compactness_se,
+            data.concavity_se, data.concave_points_se, data.symmetry_se, data.fractal_dimension_se,
+            data.radius_worst, data.texture_worst, data.perimeter_worst, data.area_worst,
+            data.smoothness_worst, data.compactness_worst, data.concavity_worst,
+            data.concave_points_worst, data.symmetry_worst, data.fractal_dimension_worst
+        )
         
         try:
-            # Create feature dictionary with the exact feature names used during model training
-            feature_dict = {
-                'radius_mean': float(data.radius_mean),
-                'texture_mean': float(data.texture_mean),
-                'perimeter_mean': float(data.perimeter_mean),
-                'area_mean': float(data.area_mean),
-                'smoothness_mean': float(data.smoothness_mean),
-                'compactness_mean': float(data.compactness_mean),
-                'concavity_mean': float(data.concavity_mean),
-                'concave points_mean': float(data.concave_points_mean),  
-                'symmetry_mean': float(data.symmetry_mean),
-                'fractal_dimension_mean': float(data.fractal_dimension_mean),
-                'radius_se': float(data.radius_se),
-                'texture_se': float(data.texture_se),
-                'perimeter_se': float(data.perimeter_se),
-                'area_se': float(data.area_se),
-                'smoothness_se': float(data.smoothness_se),
-                'compactness_se': float(data.compactness_se),
-                'concavity_se': float(data.concavity_se),
-                'concave points_se': float(data.concave_points_se),  
-                'symmetry_se': float(data.symmetry_se),
-                'fractal_dimension_se': float(data.fractal_dimension_se),
-                'radius_worst': float(data.radius_worst),
-                'texture_worst': float(data.texture_worst),
-                'perimeter_worst': float(data.perimeter_worst),
-                'area_worst': float(data.area_worst),
-                'smoothness_worst': float(data.smoothness_worst),
-                'compactness_worst': float(data.compactness_worst),
-                'concavity_worst': float(data.concavity_worst),
-                'concave points_worst': float(data.concave_points_worst),  
-                'symmetry_worst': float(data.symmetry_worst),
-                'fractal_dimension_worst': float(data.fractal_dimension_worst)
-            }
-
-            features = pd.DataFrame([feature_dict])
-            
-            # Ensure columns are in the correct order with exact feature names from training
-            feature_names = [
-                'radius_mean', 'texture_mean', 'perimeter_mean', 'area_mean',
-                'smoothness_mean', 'compactness_mean', 'concavity_mean', 'concave points_mean',
-                'symmetry_mean', 'fractal_dimension_mean', 'radius_se', 'texture_se',
-                'perimeter_se', 'area_se', 'smoothness_se', 'compactness_se',
-                'concavity_se', 'concave points_se', 'symmetry_se', 'fractal_dimension_se',
-                'radius_worst', 'texture_worst', 'perimeter_worst', 'area_worst',
-                'smoothness_worst', 'compactness_worst', 'concavity_worst',
-                'concave points_worst', 'symmetry_worst', 'fractal_dimension_worst'
-            ]
-            
-            features = features[feature_names]
+            # Get prediction and probability
+            prediction, probabilities = await predict_cached("breast", features)
             
-            logger.info(f"Feature names being used: {feature_names}")
-            logger.info(f"Feature shape: {features.shape}")
-            logger.info(f"Feature columns: {features.columns.tolist()}")
-            
-            try:
-                # Get prediction and probability
-                prediction = model.predict(features)[0]
-                
-                # Get probability with more variation
-                try:
-                    probabilities = model.predict_proba(features)[0]
-                    # Ensure we're using the correct probability for the predicted class
-                    # In most scikit-learn models, index 1 is for the positive class (malignant)
-                    # but we should make sure we're using the right one
-                    positive_class_index = 1  # Usually index 1 is for the positive class (malignant)
-                    
-                    # Get the raw probability
-                    raw_probability = float(probabilities[positive_class_index])
-                    
-                    # Add some variation to avoid always getting the same probabilities
-                    # This will make the results more realistic and varied
-                    variation = np.random.uniform(-0.1, 0.1)  # Add up to 10% variation
-                    
-                    # Ensure the probability stays within reasonable bounds
-                    if prediction:  # If malignant (positive)
-                        # For malignant, use higher probabilities (0.6 to 0.95)
-                        raw_probability = max(0.6, min(0.95, raw_probability + variation))
-                    else:  # If benign (negative)
-                        # For benign, use lower probabilities (0.05 to 0.4)
-                        raw_probability = max(0.05, min(0.4, raw_probability + variation))
-                    
-                    logger.info(f"Raw probability with variation: {raw_probability}")
-                except Exception as e:
-                    logger.warning(f"Error getting probability: {str(e)}")
-                    # If predict_proba fails, generate a reasonable probability based on prediction
-                    if prediction:  # If malignant
-                        raw_probability = np.random.uniform(0.7, 0.95)
-                    else:  # If benign
-                        raw_probability = np.random.uniform(0.05, 0.3)
-                    logger.info(f"Generated fallback probability: {raw_probability}")
+            # Get probability with more variation
+            if probabilities is not None:
+                # Ensure we're using the correct probability for the predicted class
+                # In most scikit-learn models, index 1 is for the positive class (malignant)
+                # but we should make sure we're using the right one
+                positive_class_index = 1  # Usually index 1 is for the positive class (malignant)
                 
-                # Format and clamp probability
-                probability = float(format(max(0.0, min(1.0, raw_probability)), '.4f'))  # Clamp between 0 and 1
+                # Get the raw probability
+                raw_probability = float(probabilities[positive_class_index])
                 
-                # Determine risk level based on probability
-                risk_level = get_risk_level(probability)
+                # Add some variation to avoid always getting the same probabilities
+                # This will make the results more realistic and varied
+                variation = np.random.uniform(-0.1, 0.1)  # Add up to 10% variation
                 
-                logger.info(f"Prediction successful. Result: {prediction}, Risk Level: {risk_level}, Probability: {probability}")
+                # Ensure the probability stays within reasonable bounds
+                if prediction:  # If malignant (positive)
+                    # For malignant, use higher probabilities (0.6 to 0.95)
+                    raw_probability = max(0.6, min(0.95, raw_probability + variation))
+                else:  # If benign (negative)
+                    # For benign, use lower probabilities (0.05 to 0.4)
+                    raw_probability = max(0.05, min(0.4, raw_probability + variation))
                 
-                return {
-                    "prediction": bool(prediction),
-                    "risk_level": risk_level,
-                    "probability": probability
-                }
-            except Exception as model_error:
-                logger.error(f"Model prediction error: {str(model_error)}")
-                logger.error(f"Feature shape: {features.shape}")
-                logger.error(f"Feature columns: {features.columns.tolist()}")
-                raise HTTPException(
-                    status_code=500,
-                    detail="Error during prediction. Please ensure all input values are valid."
-                )
-
-        except (ValueError, KeyError) as e:
-            logger.error(f"Value conversion error: {str(e)}")
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Raw probability with variation: {raw_probability}")
+            else:
+                # If the model has no predict_proba, generate a reasonable probability based on prediction
+                if prediction:  # If malignant
+                    raw_probability = np.random.uniform(0.7, 0.95)
+                else:  # If benign
+                    raw_probability = np.random.uniform(0.05, 0.3)
+                if logger.isEnabledFor(logging.DEBUG):
+                    logger.debug(f"Generated fallback probability: {raw_probability}")
+            
+            # Format and clamp probability
+            probability = _clamp4(raw_probability)
+            
+            # Determine risk level based on probability
+            risk_level = get_risk_level(probability)
+            
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f"Prediction successful. Result: {prediction}, Risk Level: {risk_level}, Probability: {probability}")
+            
+            return {
+                "prediction": bool(prediction),
+                "risk_level": risk_level,
+                "probability": probability
+            }
+        except Exception as model_error:
+            logger.error(f"Model prediction error: {str(model_error)}")
+            logger.error(f"Feature values: {features}")
             raise HTTPException(
-                status_code=400,
-                detail="Invalid input values. Please check the format of all fields."
+                status_code=500,
+                detail="Error during prediction. Please ensure all input values are valid."
             )
 
     except Exception as e:
@@ -957,26 +1216,29 @@ async def predict_breast(data: BreastCancerInput):
             detail="An unexpected error occurred. Please try again later."
         )
 
-@app.post("/predict/general")
+@app.post("/predict/general", response_model=GeneralPredictionResponse)
 async def predict_general(data: GeneralInput):
     try:
         # Validate input
         if not data.symptoms or len(data.symptoms) == 0:
             raise HTTPException(status_code=400, detail="At least one symptom is required")
 
-        # Initialize the disease model
-        model = DiseaseModel()
-        # Use absolute path to the model file
-        import os
-        current_dir = os.path.dirname(os.path.abspath(__file__))
-        model_path = os.path.join(current_dir, 'saved_models', 'xgboost_model.json')
-        model.load_xgboost(model_path)
+        model = MODELS.get("general")
+        if model is None:
+            raise HTTPException(status_code=500, detail="Disease prediction model is not loaded")
         
         # Convert symptoms to model input format
         features = prepare_symptoms_array(data.symptoms)
         
-        # Get prediction and probability
-        disease, probability = model.predict(features)
+        # Get prediction and probability; the symptom vector is binary, so the
+        # indices of the present symptoms identify it exactly
+        key = ("general", tuple(np.flatnonzero(features).tolist()))
+        cached = PREDICTION_CACHE.get(key)
+        if cached is None:
+            cached = await run_inference(_predict_general_sync, features)
+            if PREDICTION_CACHE_SIZE > 0:
+                PREDICTION_CACHE[key] = cached
+        disease, probability = cached
         
         # Get description and precautions
         description = model.describe_disease(disease)
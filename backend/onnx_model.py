@@ -0,0 +1,34 @@
+import numpy as np
+import onnxruntime as ort
+
+class OnnxModel:
+    '''
+    Run a classifier exported by convert_to_onnx.py through ONNX Runtime.
+
+    Exposes the predict/predict_proba subset of the scikit-learn API the
+    prediction endpoints use, plus predict_with_proba which returns both from
+    a single session run.
+    '''
+
+    def __init__(self, model_path):
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        # Requests are already batched and spread over the inference threadpool
+        options.intra_op_num_threads = 1
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=["CPUExecutionProvider"]
+        )
+        self.input_name = self.session.get_inputs()[0].name
+        self.n_features_in_ = self.session.get_inputs()[0].shape[1]
+
+    def predict_with_proba(self, X):
+        labels, probabilities = self.session.run(
+            None, {self.input_name: np.asarray(X, dtype=np.float32)}
+        )
+        return labels, probabilities
+
+    def predict(self, X):
+        return self.predict_with_proba(X)[0]
+
+    def predict_proba(self, X):
+        return self.predict_with_proba(X)[1]